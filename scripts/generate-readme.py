@@ -4,29 +4,16 @@
 import re
 from pathlib import Path
 
+# Shares the frontmatter parser with the search tool (same directory,
+# so the plain import resolves when either script is run directly).
+from search_skills import parse_frontmatter
+
 ROOT = Path(__file__).parent.parent
 README = ROOT / "README.md"
 SKILLS_DIR = ROOT / "skills"
 COMMANDS_DIR = ROOT / "commands"
 
-
-def parse_frontmatter(content: str) -> dict:
-    """Extract YAML frontmatter from markdown content."""
-    match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-    if not match:
-        return {}
-
-    frontmatter = {}
-    for line in match.group(1).split("\n"):
-        if ":" in line:
-            key, _, value = line.partition(":")
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            # Handle multi-line descriptions (take first line only for table)
-            if not value and key == "description":
-                continue
-            frontmatter[key] = value
-    return frontmatter
+_RX_HEADING = re.compile(r"^#\s+(.+)$", re.MULTILINE)
 
 
 def get_skills() -> list[dict]:
@@ -35,13 +22,10 @@ def get_skills() -> list[dict]:
     if not SKILLS_DIR.exists():
         return skills
 
-    for skill_dir in sorted(SKILLS_DIR.iterdir()):
-        if not skill_dir.is_dir():
-            continue
-        skill_file = skill_dir / "SKILL.md"
-        if not skill_file.exists():
-            continue
-
+    # One non-recursive glob replaces the iterdir + is_dir + exists
+    # checks per entry.
+    for skill_file in sorted(SKILLS_DIR.glob("*/SKILL.md")):
+        skill_dir = skill_file.parent
         content = skill_file.read_text()
         meta = parse_frontmatter(content)
 
@@ -77,7 +61,7 @@ def get_commands() -> list[dict]:
         else:
             # Fall back to parsing heading
             name = cmd_file.stem
-            heading_match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
+            heading_match = _RX_HEADING.search(content)
             description = heading_match.group(1) if heading_match else ""
 
         if len(description) > 80:
@@ -110,26 +94,20 @@ def generate_table(items: list[dict], type_name: str) -> str:
 
 def update_readme(skills: list[dict], commands: list[dict]) -> bool:
     """Update README.md with generated tables. Returns True if changed."""
-    content = README.read_text()
-    original = content
-
-    # Update skills section
-    skills_table = generate_table(skills, "Skills")
-    content = re.sub(
-        r"(## Skills\n\n).*?(?=\n\n## |\Z)",
-        rf"\1{skills_table}",
-        content,
-        flags=re.DOTALL,
-    )
-
-    # Update commands section
-    commands_table = generate_table(commands, "Commands")
-    content = re.sub(
-        r"(## Commands\n\n).*?(?=\n\n## |\Z)",
-        rf"\1{commands_table}",
-        content,
-        flags=re.DOTALL,
-    )
+    original = README.read_text()
+
+    # Split into "## " sections once and swap the table bodies in
+    # place, instead of two backtracking regex passes over the file.
+    tables = {
+        "Skills": generate_table(skills, "Skills"),
+        "Commands": generate_table(commands, "Commands"),
+    }
+    parts = original.split("\n\n## ")
+    for i in range(1, len(parts)):
+        heading, _, _ = parts[i].partition("\n\n")
+        if heading in tables:
+            parts[i] = f"{heading}\n\n{tables[heading]}"
+    content = "\n\n## ".join(parts)
 
     if content != original:
         README.write_text(content)
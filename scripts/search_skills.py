@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""Apropos-style search over skills and commands.
+
+Scans skill and command frontmatter into a keyword index cached at
+.apropos.json, then scores query words against artifact names,
+keywords, and descriptions.
+"""
+
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    # Optional: compiled fuzzy matching for near-miss query tokens.
+    from rapidfuzz import process as _fuzzy
+except ImportError:
+    _fuzzy = None
+
+INDEX_NAME = ".apropos.json"
+
+# Hits scoring below this (e.g. lone half-weight fuzzy matches) are noise.
+MIN_SCORE = 10
+DEFAULT_LIMIT = 10
+
+# The closing delimiter must be a full "---" line, matching the byte
+# scanner's semantics, so dash runs inside the YAML don't end the block.
+_RX_FM = re.compile(r"^---\n(.*?)\n---(?=\n|\Z)", re.DOTALL)
+_RX_H1 = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+
+
+class _NonAlnumTable(dict):
+    """str.translate table mapping non-alphanumerics to spaces.
+
+    Entries are computed on first lookup and memoized, so tokenization
+    is a single bulk translate instead of a regex substitution.
+    """
+
+    def __missing__(self, code: int) -> str:
+        ch = chr(code)
+        keep = "a" <= ch <= "z" or "A" <= ch <= "Z" or "0" <= ch <= "9" or ch.isspace()
+        result = ch if keep else " "
+        self[code] = result
+        return result
+
+
+_TRANS = _NonAlnumTable()
+
+_STOPWORDS = frozenset({
+    "the", "and", "for", "use", "when", "with", "that", "this",
+    "from", "are", "can", "you", "your", "has", "have", "will",
+    "its", "any", "all", "not", "but", "into", "how", "what",
+})
+
+
+def find_root() -> Path:
+    """Locate the grimoire root by walking up from the current directory."""
+    # Walk upward lazily instead of materializing every ancestor.
+    path = Path.cwd()
+    while True:
+        if (path / "tome.yaml").exists():
+            return path
+        if path.parent == path:
+            break
+        path = path.parent
+    # Fall back to the repo this script lives in
+    return Path(__file__).parent.parent
+
+
+def parse_frontmatter(content: str) -> dict:
+    """Extract YAML frontmatter from markdown content."""
+    match = _RX_FM.match(content)
+    if not match:
+        return {}
+
+    frontmatter = {}
+    for line in match.group(1).split("\n"):
+        if ":" in line:
+            key, _, value = line.partition(":")
+            key = key.strip()
+            value = value.strip().strip('"').strip("'")
+            if not value and key == "description":
+                continue
+            frontmatter[key] = value
+    return frontmatter
+
+
+def _read_frontmatter_bytes(path: str | Path, limit: int = 8192) -> str:
+    """Read just enough of a file to cover its frontmatter block.
+
+    SKILL.md bodies can be large but only the bytes up to the closing
+    ``---`` matter here, so read a bounded prefix and decode only the
+    frontmatter slice.
+    """
+    with open(path, "rb") as f:
+        head = f.read(limit)
+        if not head.startswith(b"---\n"):
+            return ""
+        full_file = len(head) < limit
+        after = _find_frontmatter_end(head)
+        # A match ending exactly at the chunk boundary is only a real
+        # delimiter if the buffer is the whole file; otherwise the next
+        # byte on disk could extend the line (e.g. a "----" run), so
+        # leave it to the mmap re-scan below to confirm.
+        if after != -1 and (full_file or after < len(head)):
+            return head[:after].decode("utf-8", errors="replace")
+        if full_file:
+            # Whole file seen, no closing delimiter.
+            return ""
+        # Frontmatter outgrew the bounded read: map the file and keep
+        # scanning from the chunk boundary without slurping the body.
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            after = _find_frontmatter_end(mm, max(4, limit - 4))
+            if after == -1:
+                return ""
+            return mm[:after].decode("utf-8", errors="replace")
+
+
+def _find_frontmatter_end(buf, pos: int = 4) -> int:
+    """Return the end offset of a line that is exactly "---", or -1.
+
+    A bare find() would stop at lines like "----" inside the YAML body,
+    so each hit is checked for a newline (or end of buffer) after it.
+    """
+    size = len(buf)
+    while True:
+        end = buf.find(b"\n---", pos)
+        if end == -1:
+            return -1
+        after = end + 4
+        if after >= size or buf[after:after + 1] == b"\n":
+            return after
+        pos = end + 1
+
+
+def parse_skill_frontmatter(skill_md: str | Path) -> dict:
+    """Parse the frontmatter of a SKILL.md file."""
+    return parse_frontmatter(_read_frontmatter_bytes(skill_md))
+
+
+def parse_command(cmd_file: str | Path) -> dict:
+    """Parse a command file into name and description."""
+    # Only the frontmatter or the first heading matters, so a bounded
+    # read is enough even for long command bodies.
+    with open(cmd_file, "rb") as f:
+        content = f.read(2048).decode("utf-8", errors="replace")
+
+    stem = os.path.splitext(os.path.basename(cmd_file))[0]
+    meta = parse_frontmatter(content)
+    if meta:
+        name = meta.get("name", stem)
+        description = meta.get("description", "")
+    else:
+        # Fall back to the first heading
+        name = stem
+        heading_match = _RX_H1.search(content)
+        description = heading_match.group(1) if heading_match else ""
+
+    return {"name": name, "description": description}
+
+
+def extract_keywords(name: str, description: str) -> list[str]:
+    """Derive search keywords from an artifact's name and description."""
+    text = description.lower().translate(_TRANS)
+    keywords = []
+    seen = set()
+    for word in name.lower().replace("-", " ").split() + text.split():
+        if len(word) > 2 and word not in _STOPWORDS and word not in seen:
+            seen.add(word)
+            keywords.append(word)
+    return keywords
+
+
+def _scandir_sorted(path: str | Path) -> list[os.DirEntry]:
+    """List a directory via os.scandir, sorted by name; [] if missing."""
+    try:
+        with os.scandir(path) as it:
+            return sorted(it, key=lambda e: e.name)
+    except FileNotFoundError:
+        return []
+
+
+def _stat_manifest(root: Path) -> dict:
+    """Walk skills/ and commands/ once, mapping artifact path -> mtime."""
+    manifest = {}
+    for entry in _scandir_sorted(root / "skills"):
+        if not entry.is_dir(follow_symlinks=False) or entry.name.startswith("."):
+            continue
+        try:
+            st = os.stat(os.path.join(entry.path, "SKILL.md"))
+        except FileNotFoundError:
+            continue
+        manifest[f"skills/{entry.name}/"] = st.st_mtime_ns
+
+    for entry in _scandir_sorted(root / "commands"):
+        if not entry.name.endswith(".md") or entry.name.startswith("."):
+            continue
+        manifest[f"commands/{entry.name}"] = entry.stat().st_mtime_ns
+
+    return manifest
+
+
+def _content_key(name: str, description: str) -> str:
+    """Digest of the fields keywords are derived from."""
+    return hashlib.md5(f"{name}\0{description}".encode()).hexdigest()
+
+
+def _artifact_from_path(root: Path, path: str, mtime: int,
+                        keyword_cache: dict | None = None) -> dict:
+    """Parse one manifest entry into an artifact record."""
+    if path.startswith("skills/"):
+        dir_name = path.split("/")[1]
+        meta = parse_skill_frontmatter(os.path.join(root, path, "SKILL.md"))
+        name = meta.get("name", dir_name)
+        description = meta.get("description", "")
+        artifact_type = "skill"
+    else:
+        meta = parse_command(os.path.join(root, path))
+        name = meta["name"]
+        description = meta["description"]
+        artifact_type = "command"
+
+    keywords = None
+    if keyword_cache is not None:
+        keywords = keyword_cache.get(_content_key(name, description))
+    if keywords is None:
+        keywords = extract_keywords(name, description)
+
+    return {
+        "type": artifact_type,
+        "name": name,
+        "description": description,
+        "path": path,
+        "keywords": keywords,
+        "mtime": mtime,
+    }
+
+
+def scan_all_artifacts(root: Path, manifest: dict | None = None,
+                       prev: dict | None = None) -> list[dict]:
+    """Scan skills and commands under the given root.
+
+    Accepts a prebuilt stat manifest so a staleness check that already
+    walked the tree doesn't force a second walk during rebuild, and the
+    previous index so unchanged name/description pairs reuse their
+    extracted keywords instead of being re-tokenized.
+    """
+    if manifest is None:
+        manifest = _stat_manifest(root)
+    keyword_cache = None
+    if prev is not None:
+        keyword_cache = {
+            _content_key(a["name"], a["description"]): a["keywords"]
+            for a in prev.get("artifacts", [])
+        }
+    items = sorted(manifest.items())
+    if len(items) > 1:
+        # Parsing is one bounded read per artifact, so overlap the I/O
+        # across a small pool; map preserves manifest order.
+        with ThreadPoolExecutor(max_workers=min(8, len(items))) as pool:
+            return list(pool.map(
+                lambda item: _artifact_from_path(root, item[0], item[1], keyword_cache),
+                items,
+            ))
+    return [_artifact_from_path(root, path, mtime, keyword_cache)
+            for path, mtime in items]
+
+
+def _dir_mtimes(root: Path) -> dict:
+    """Snapshot mtimes of the scanned directories.
+
+    Includes each skill's own directory so that atomically replaced
+    SKILL.md files (the common editor save path) are caught too.
+    """
+    mtimes = {}
+    skills_dir = root / "skills"
+    if skills_dir.exists():
+        mtimes["skills"] = skills_dir.stat().st_mtime_ns
+        with os.scandir(skills_dir) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False) and not entry.name.startswith("."):
+                    mtimes[f"skills/{entry.name}"] = entry.stat().st_mtime_ns
+    commands_dir = root / "commands"
+    if commands_dir.exists():
+        mtimes["commands"] = commands_dir.stat().st_mtime_ns
+    return mtimes
+
+
+def build_postings(artifacts: list[dict]) -> dict:
+    """Build an inverted token -> [[artifact, weight], ...] index.
+
+    Weights mirror the old per-artifact scoring: 100 for the full name,
+    50 for name tokens, 20 for keywords, 10 for description tokens.
+    Each token keeps its highest weight per artifact.
+    """
+    postings = defaultdict(list)
+    for i, artifact in enumerate(artifacts):
+        name = artifact["name"].lower()
+        weights = {}
+        for token in artifact["description"].lower().translate(_TRANS).split():
+            if len(token) > 2:
+                weights[token] = 10
+        for token in artifact["keywords"]:
+            weights[token] = 20
+        for token in name.replace("-", " ").split():
+            weights[token] = 50
+        weights[name] = 100
+        for token, weight in weights.items():
+            postings[token].append([i, weight])
+    return dict(postings)
+
+
+def build_index(root: Path, manifest: dict | None = None,
+                prev: dict | None = None) -> dict:
+    """Rebuild the search index and persist it to .apropos.json."""
+    artifacts = scan_all_artifacts(root, manifest, prev)
+    index = {
+        "artifacts": artifacts,
+        "postings": build_postings(artifacts),
+        "dir_mtimes": _dir_mtimes(root),
+    }
+    _write_index(root, index)
+    return index
+
+
+def _write_index(root: Path, index: dict) -> None:
+    """Persist the index atomically, skipping the write if unchanged.
+
+    Writing to a temp file and renaming over the target means a reader
+    never sees a half-written index; fsync before the rename so the
+    rename can't land ahead of the data.
+    """
+    data = json.dumps(index, separators=(",", ":")).encode()
+    index_file = root / INDEX_NAME
+    try:
+        if index_file.read_bytes() == data:
+            return
+    except OSError:
+        pass
+
+    tmp = index_file.with_suffix(".json.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, index_file)
+    _index_cache[str(index_file)] = (index_file.stat().st_mtime_ns, index)
+
+
+# Parsed indexes cached per path for the life of the process, keyed by
+# file mtime so repeated searches skip json.loads when nothing changed.
+_index_cache: dict[str, tuple[int, dict]] = {}
+
+
+def load_index(root: Path) -> dict | None:
+    """Load the persisted index, or None if missing/corrupt."""
+    index_file = root / INDEX_NAME
+    try:
+        mtime = index_file.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    key = str(index_file)
+    cached = _index_cache.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        index = json.loads(index_file.read_text())
+    except (json.JSONDecodeError, OSError):
+        return None
+    _index_cache[key] = (mtime, index)
+    return index
+
+
+def ensure_index(root: Path) -> dict:
+    """Return a fresh index, walking the tree at most once.
+
+    The stat manifest computed for the staleness check is handed
+    straight to build_index on a miss, so a stale index costs one walk
+    plus the parses instead of two walks. An index missing expected
+    keys (e.g. a cache written by an older version) is rebuilt.
+    """
+    index = load_index(root)
+    if index is not None and "postings" in index and "artifacts" in index:
+        # Fast path: adding, removing, or atomically replacing an
+        # entry bumps its parent directory's mtime, so matching
+        # snapshots mean nothing changed. Editors that write in place
+        # won't bump the directory; --rebuild covers that case.
+        dir_mtimes = _dir_mtimes(root)
+        if dir_mtimes == index.get("dir_mtimes"):
+            return index
+        manifest = _stat_manifest(root)
+        if manifest == {a["path"]: a["mtime"] for a in index["artifacts"]}:
+            # The dir bump was spurious (e.g. a transient temp file);
+            # persist the fresh snapshot so the fast path isn't
+            # permanently disabled.
+            index["dir_mtimes"] = dir_mtimes
+            _write_index(root, index)
+            return index
+        return build_index(root, manifest, prev=index)
+    return build_index(root)
+
+
+def search(query: str, root: Path, limit: int = DEFAULT_LIMIT) -> list[dict]:
+    """Search artifacts, rebuilding the index if stale."""
+    # Tokenize once and dedupe so repeated words don't double-count.
+    query_words = list(dict.fromkeys(query.lower().split()))
+    if not query_words:
+        return []
+
+    index = ensure_index(root)
+
+    postings = index["postings"]
+    scores = defaultdict(int)
+    for qw in query_words:
+        hits = postings.get(qw)
+        if hits is None and _fuzzy is not None:
+            # Hand the per-token comparison loop to rapidfuzz's C
+            # implementation; fuzzy hits count at half weight.
+            match = _fuzzy.extractOne(qw, postings.keys(), score_cutoff=85)
+            if match is not None:
+                for i, weight in postings[match[0]]:
+                    scores[i] += weight // 2
+            continue
+        for i, weight in hits or ():
+            scores[i] += weight
+
+    # Reference the artifact records rather than copying their fields
+    # into every result dict, and keep only the top hits via a heap
+    # instead of sorting every candidate.
+    artifacts = index["artifacts"]
+    candidates = [{"score": score, "artifact": artifacts[i]}
+                  for i, score in scores.items() if score >= MIN_SCORE]
+    return heapq.nsmallest(
+        limit, candidates,
+        key=lambda r: (-r["score"], r["artifact"]["name"]),
+    )
+
+
+def main():
+    args = sys.argv[1:]
+    root = find_root()
+
+    if args and args[0] == "--rebuild":
+        index = build_index(root)
+        print(f"Indexed {len(index['artifacts'])} artifacts.")
+        return
+
+    if not args:
+        print("usage: search_skills.py [--rebuild] <query>...", file=sys.stderr)
+        sys.exit(2)
+
+    results = search(" ".join(args), root)
+    if not results:
+        print("No matches.")
+        return
+
+    for r in results:
+        a = r["artifact"]
+        print(f"{r['score']:4d}  {a['type']:<7s} {a['name']:<24s} {a['description']}")
+
+
+if __name__ == "__main__":
+    main()